@@ -1,18 +1,24 @@
-import heapq
-from typing import Dict, List, Tuple, Any
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple, Any, Union
+
+from csr_graph import CSRGraph, as_csr
+
+# Largest edge weight for which Dial's bucket queue is used instead of a heap
+DIAL_MAX_WEIGHT = 100
 
 def dijkstra(
-    graph: Dict[Any, List[Tuple[Any, float]]],
+    graph: Union[Dict[Any, List[Tuple[Any, float]]], CSRGraph],
     source: Any
-) -> Tuple[Dict[Any, float], Dict[Any, Any]]:
+) -> Tuple[Dict[Any, float], Dict[Any, Any], Dict[Any, int]]:
     """
     Compute shortest paths from `source` to all other nodes in `graph`.
 
     Parameters
     ----------
-    graph : dict
+    graph : dict or CSRGraph
         Adjacency list representation of the graph where
-        graph[u] = [(v, w_uv), ...] indicates an edge u->v of weight w_uv.
+        graph[u] = [(v, w_uv), ...] indicates an edge u->v of weight w_uv,
+        or the same graph already converted to a CSRGraph.
     source : hashable
         The starting node.
 
@@ -22,43 +28,389 @@ def dijkstra(
         dist[v] is the length of the shortest path from source to v.
     prev : dict
         prev[v] is the predecessor of v along the shortest path from source.
+    depth : dict
+        depth[v] is the number of edges on that path (-1 if v is unreachable).
+    """
+    # Work on integer node ids so the hot loop never hashes node labels
+    csr = as_csr(graph)
+    labels, indptr, indices, weights = csr.label_of, csr.indptr, csr.indices, csr.weights
+    n = csr.num_vertices
+    s = csr.id_of[source]
+
+    # Initialize distances and predecessor arrays (-1 means no predecessor)
+    dist = array('d', [float('inf')]) * n
+    prev = array('i', [-1]) * n
+    depth = array('i', [-1]) * n
+    dist[s] = 0
+    depth[s] = 0
+
+    max_weight = _max_small_integer_weight(weights)
+    if max_weight is not None:
+        _dial(indptr, indices, weights, s, dist, prev, depth, max_weight)
+    else:
+        _heap_dijkstra(indptr, indices, weights, s, dist, prev, depth)
+
+    # Translate ids back to node labels once, at the end
+    return (
+        {labels[i]: dist[i] for i in range(n)},
+        {labels[i]: labels[prev[i]] if prev[i] >= 0 else None for i in range(n)},
+        {labels[i]: depth[i] for i in range(n)},
+    )
+
+def dijkstra_bidirectional(
+    graph: Union[Dict[Any, List[Tuple[Any, float]]], CSRGraph],
+    source: Any,
+    target: Any
+) -> Tuple[float, List[Any]]:
     """
-    # Initialize distances and predecessor map
-    dist: Dict[Any, float] = {node: float('inf') for node in graph}
-    prev: Dict[Any, Any] = {node: None for node in graph}
-    dist[source] = 0
+    Compute the shortest path from `source` to `target` only.
+
+    Two searches run at once, forward from source and backward from target
+    over the reversed edges, and stop once no path through the unsettled
+    nodes can beat the best meeting point found so far.
+
+    Parameters
+    ----------
+    graph : dict or CSRGraph
+        The graph, as for dijkstra(). Weights must be non-negative. Pass a
+        CSRGraph when running many queries, so its reversed graph is built
+        only once.
+    source, target : hashable
+        The end points of the path.
+
+    Returns
+    -------
+    distance : float
+        The length of the shortest path (inf if target is unreachable).
+    path : list
+        The nodes [source, ..., target], or an empty list if unreachable.
+    """
+    forward = as_csr(graph)
+    backward = forward.reverse()
+    n = forward.num_vertices
+    s, t = forward.id_of[source], forward.id_of[target]
+    if s == t:
+        return 0.0, [source]
+
+    # Index 0 is the forward search from s, index 1 the backward search from t
+    csrs = (forward, backward)
+    dist = (array('d', [float('inf')]) * n, array('d', [float('inf')]) * n)
+    prev = (array('i', [-1]) * n, array('i', [-1]) * n)
+    heaps = (_IndexedMinHeap(n), _IndexedMinHeap(n))
+    dist[0][s] = 0
+    dist[1][t] = 0
+    heaps[0].push(s, 0)
+    heaps[1].push(t, 0)
 
-    # Min-heap of (distance_so_far, node)
-    heap: List[Tuple[float, Any]] = [(0, source)]
+    # Best source → target distance seen so far, and the node where it meets
+    best = float('inf')
+    meet = -1
+
+    while heaps[0] and heaps[1]:
+        top_f, top_b = heaps[0].peek_key(), heaps[1].peek_key()
+        if top_f + top_b >= best:
+            break  # Any path through an unsettled node is at least this long
+
+        # Advance the search whose frontier is closer
+        side = 0 if top_f <= top_b else 1
+        csr, d, p, heap, other = csrs[side], dist[side], prev[side], heaps[side], dist[1 - side]
+        indptr, indices, weights = csr.indptr, csr.indices, csr.weights
+        d_u, u = heap.pop()
+
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            alt = d_u + weights[k]
+            if alt < d[v]:
+                d[v] = alt
+                p[v] = u
+                heap.push(v, alt)
+            # The edge joins the two searches if v already has a distance from the other end
+            if alt + other[v] < best:
+                best = alt + other[v]
+                meet = v
+
+    if meet < 0:
+        return float('inf'), []
+
+    # source → meet from the forward tree, then meet → target from the backward tree
+    labels = forward.label_of
+    path = _path_to(prev[0], labels, meet)
+    at = prev[1][meet]
+    while at != -1:
+        path.append(labels[at])
+        at = prev[1][at]
+    return best, path
+
+def astar(
+    graph: Union[Dict[Any, List[Tuple[Any, float]]], CSRGraph],
+    source: Any,
+    target: Any,
+    h: Callable[[Any], float] = lambda v: 0
+) -> Tuple[float, List[Any]]:
+    """
+    Compute the shortest path from `source` to `target` with A* search.
+
+    This is the dijkstra() heap loop with nodes ordered by g(v) + h(v)
+    instead of g(v), so nodes that look closer to the target are settled
+    first. The default h = 0 reduces it to Dijkstra stopped at the target.
+
+    Parameters
+    ----------
+    graph : dict or CSRGraph
+        The graph, as for dijkstra(). Weights must be non-negative.
+    source, target : hashable
+        The end points of the path.
+    h : callable
+        h(v) estimates the distance from node v to target. It must never
+        overestimate it (be admissible) for the result to be a shortest path.
+
+    Returns
+    -------
+    distance : float
+        The length of the shortest path (inf if target is unreachable).
+    path : list
+        The nodes [source, ..., target], or an empty list if unreachable.
+    """
+    csr = as_csr(graph)
+    labels, indptr, indices, weights = csr.label_of, csr.indptr, csr.indices, csr.weights
+    n = csr.num_vertices
+    s, t = csr.id_of[source], csr.id_of[target]
+
+    # g_score[v] is the true distance found so far; the heap is keyed by g + h
+    g_score = array('d', [float('inf')]) * n
+    prev = array('i', [-1]) * n
+    h_of: List[Optional[float]] = [None] * n  # h evaluated at most once per node
+    g_score[s] = 0
+    heap = _IndexedMinHeap(n)
+    heap.push(s, h(source))
 
     while heap:
-        d_u, u = heapq.heappop(heap)
-        # If we pop a stale entry, skip it
-        if d_u > dist[u]:
-            continue
+        _, u = heap.pop()
+        if u == t:
+            break
+        g_u = g_score[u]
+
+        # Relax all outgoing edges (u → v); a settled v is re-queued if it improves,
+        # which only happens when h is admissible but not consistent
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            alt = g_u + weights[k]
+            if alt < g_score[v]:
+                g_score[v] = alt
+                prev[v] = u
+                if h_of[v] is None:
+                    h_of[v] = h(labels[v])
+                heap.push(v, alt + h_of[v])
+
+    if g_score[t] == float('inf'):
+        return float('inf'), []
+    return g_score[t], _path_to(prev, labels, t)
+
+def _path_to(prev: array, labels: List[Any], v: int) -> List[Any]:
+    """
+    Follow prev from node id v back to the search root and return the
+    labels along the way, root first.
+    """
+    path: List[Any] = []
+    while v != -1:
+        path.append(labels[v])
+        v = prev[v]
+    path.reverse()
+    return path
+
+def _heap_dijkstra(
+    indptr: array,
+    indices: array,
+    weights: array,
+    s: int,
+    dist: array,
+    prev: array,
+    depth: array
+) -> None:
+    """
+    Heap-based Dijkstra over a CSR graph, filling dist, prev and depth in place.
+    """
+    # Indexed min-heap of node ids keyed by distance_so_far; each node is in it at most once
+    heap = _IndexedMinHeap(len(dist))
+    heap.push(s, 0)
+
+    while heap:
+        d_u, u = heap.pop()
 
         # Relax all outgoing edges (u → v)
-        for v, weight in graph[u]:
-            alt = d_u + weight
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            alt = d_u + weights[k]
             if alt < dist[v]:
                 dist[v] = alt
                 prev[v] = u
-                heapq.heappush(heap, (alt, v))
+                depth[v] = depth[u] + 1
+                heap.push(v, alt)
+
+def _dial(
+    indptr: array,
+    indices: array,
+    weights: array,
+    s: int,
+    dist: array,
+    prev: array,
+    depth: array,
+    max_weight: int
+) -> None:
+    """
+    Dial's bucket-queue Dijkstra for small non-negative integer weights,
+    filling dist, prev and depth in place.
+
+    Every tentative distance still waiting to be settled lies in
+    [d, d + max_weight], so max_weight + 1 buckets used circularly suffice
+    and extract-min is just advancing d past empty buckets.
+    """
+    num_buckets = max_weight + 1
+    buckets: List[List[int]] = [[] for _ in range(num_buckets)]
+    buckets[0].append(s)
+    pending = 1
+    d = 0
+
+    while pending:
+        bucket = buckets[d % num_buckets]
+        while bucket:
+            u = bucket.pop()
+            pending -= 1
+            # If we pop a stale entry, skip it
+            if dist[u] != d:
+                continue
+
+            # Relax all outgoing edges (u → v)
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                alt = d + weights[k]
+                if alt < dist[v]:
+                    dist[v] = alt
+                    prev[v] = u
+                    depth[v] = depth[u] + 1
+                    buckets[int(alt) % num_buckets].append(v)
+                    pending += 1
+        d += 1
 
-    return dist, prev
+def _max_small_integer_weight(weights: array) -> Optional[int]:
+    """
+    Return the largest weight if every weight is a non-negative integer
+    no larger than DIAL_MAX_WEIGHT, otherwise None.
+    """
+    max_weight = 0
+    for weight in weights:
+        if weight < 0 or weight > DIAL_MAX_WEIGHT or not weight.is_integer():
+            return None
+        if weight > max_weight:
+            max_weight = weight
+    return int(max_weight)
+
+class _IndexedMinHeap:
+    """
+    4-ary min-heap of node ids 0..n-1 with decrease-key.
+
+    pos[v] is v's slot in the heap (-1 if not queued), so a node whose key
+    improves is moved up in place instead of being pushed again.
+    """
+
+    def __init__(self, n: int) -> None:
+        self.nodes: List[int] = []
+        self.keys = array('d', [float('inf')]) * n
+        self.pos = array('i', [-1]) * n
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def push(self, v: int, key: float) -> None:
+        """Insert v with the given key, or lower v's key if it is already queued."""
+        if self.pos[v] < 0:
+            self.pos[v] = len(self.nodes)
+            self.nodes.append(v)
+        self.keys[v] = key
+        self._sift_up(self.pos[v])
+
+    def peek_key(self) -> float:
+        """Return the smallest key without removing it."""
+        return self.keys[self.nodes[0]]
+
+    def pop(self) -> Tuple[float, int]:
+        """Remove and return (key, node) with the smallest key."""
+        nodes = self.nodes
+        top = nodes[0]
+        last = nodes.pop()
+        self.pos[top] = -1
+        if nodes:
+            nodes[0] = last
+            self.pos[last] = 0
+            self._sift_down(0)
+        return self.keys[top], top
+
+    def _sift_up(self, i: int) -> None:
+        nodes, keys, pos = self.nodes, self.keys, self.pos
+        v = nodes[i]
+        key = keys[v]
+        while i > 0:
+            parent = (i - 1) >> 2
+            p = nodes[parent]
+            if keys[p] <= key:
+                break
+            nodes[i] = p
+            pos[p] = i
+            i = parent
+        nodes[i] = v
+        pos[v] = i
+
+    def _sift_down(self, i: int) -> None:
+        nodes, keys, pos = self.nodes, self.keys, self.pos
+        size = len(nodes)
+        v = nodes[i]
+        key = keys[v]
+        while True:
+            child = 4 * i + 1
+            if child >= size:
+                break
+            best = child
+            best_key = keys[nodes[child]]
+            for c in range(child + 1, min(child + 4, size)):
+                c_key = keys[nodes[c]]
+                if c_key < best_key:
+                    best = c
+                    best_key = c_key
+            if best_key >= key:
+                break
+            nodes[i] = nodes[best]
+            pos[nodes[i]] = i
+            i = best
+        nodes[i] = v
+        pos[v] = i
 
 def reconstruct_path(
     prev: Dict[Any, Any],
     source: Any,
-    target: Any
+    target: Any,
+    depth: Optional[Dict[Any, int]] = None
 ) -> List[Any]:
     """
     Reconstruct the shortest path from source to target
     using the predecessor map returned by dijkstra().
 
+    If the depth map from dijkstra() is given, the path length is known up
+    front and the path is filled back to front into a preallocated list.
+
     Returns a list of nodes [source, ..., target].
     If target is unreachable, returns an empty list.
     """
+    if depth is not None:
+        length = depth[target] + 1
+        if length == 0:
+            return []  # target not reachable
+        filled: List[Any] = [None] * length
+        at = target
+        for i in range(length - 1, -1, -1):
+            filled[i] = at
+            at = prev[at]
+        return filled if filled[0] == source else []
+
     path: List[Any] = []
     at = target
     while at is not None:
@@ -83,12 +435,20 @@ if __name__ == "__main__":
     }
 
     source = 'A'
-    dist, prev = dijkstra(graph, source)
+    dist, prev, depth = dijkstra(graph, source)
 
     print("Shortest distances from", source)
     for node in sorted(dist):
         print(f"  {source} → {node}: {dist[node]}")
 
     # Reconstruct path from A to F
-    path_A_to_F = reconstruct_path(prev, source, 'F')
+    path_A_to_F = reconstruct_path(prev, source, 'F', depth)
     print("\nShortest path A → F:", " → ".join(path_A_to_F))
+
+    # Same query answered by the bidirectional search alone
+    distance_A_to_F, path_A_to_F = dijkstra_bidirectional(graph, source, 'F')
+    print(f"Bidirectional A → F: {' → '.join(path_A_to_F)} (length {distance_A_to_F})")
+
+    # A* with the default zero heuristic explores like Dijkstra but stops at F
+    distance_A_to_F, path_A_to_F = astar(graph, source, 'F')
+    print(f"A* A → F: {' → '.join(path_A_to_F)} (length {distance_A_to_F})")
@@ -1,6 +1,12 @@
 import math
+import random
+from collections import deque
 
-def bellman_ford(graph, source):
+import numpy as np
+
+from csr_graph import as_csr
+
+def bellman_ford(graph, source, rng=None):
     """
     Implements the Bellman-Ford algorithm to find the shortest paths from a single
     source vertex to all other vertices in a weighted directed graph.
@@ -8,8 +14,11 @@ def bellman_ford(graph, source):
     Args:
         graph: A dictionary representing the graph where keys are vertices and
                values are lists of tuples representing edges. Each tuple is of
-               the form (neighbor, weight).
+               the form (neighbor, weight). A CSRGraph of it is accepted too.
         source: The starting vertex.
+        rng: A random.Random, or a seed for one, used to shuffle the vertex order.
+             Pass the same seed to reproduce a run; None seeds a fresh private
+             generator, so ties between equal paths may resolve differently per call.
 
     Returns:
         A tuple containing:
@@ -20,25 +29,228 @@ def bellman_ford(graph, source):
             - has_negative_cycle: A boolean indicating whether the graph contains
                                   a negative cycle reachable from the source.
     """
-    distances = {vertex: math.inf for vertex in graph}
-    predecessors = {vertex: None for vertex in graph}
-    distances[source] = 0
-
-    # Relax edges repeatedly
-    for _ in range(len(graph) - 1):
-        for u in graph:
-            for v, weight in graph[u]:
-                if distances[u] != math.inf and distances[u] + weight < distances[v]:
-                    distances[v] = distances[u] + weight
-                    predecessors[v] = u
+    # Work on vertex ids over the CSR arrays; -1 means no predecessor
+    csr = as_csr(graph)
+    indptr, indices, weights = csr.indptr, csr.indices, csr.weights
+    n = csr.num_vertices
+    dist = [math.inf] * n
+    pred = [-1] * n
+    dist[csr.id_of[source]] = 0
+
+    # Relaxing vertices in a random order lowers the expected number of passes
+    # (Bannister & Eppstein) compared to a fixed, possibly adversarial order
+    if not isinstance(rng, random.Random):
+        rng = random.Random(rng)
+    vertex_order = list(range(n))
+    rng.shuffle(vertex_order)
+
+    # A cycle in the predecessor graph can only come from a negative cycle, so check
+    # for one every ~sqrt(|V|) passes instead of always running all |V| - 1 passes
+    check_interval = max(1, math.isqrt(n))
+
+    # Relax edges repeatedly, stopping early once a pass changes nothing
+    has_negative_cycle = None
+    for i in range(1, n):
+        changed = False
+        for u in vertex_order:
+            du = dist[u]
+            if du == math.inf:
+                continue  # Nothing reachable to relax from u yet
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                new_distance = du + weights[k]
+                if new_distance < dist[v]:
+                    dist[v] = new_distance
+                    pred[v] = u
+                    changed = True
+        if not changed:
+            has_negative_cycle = False  # Converged, so no negative cycle
+            break
+        if i % check_interval == 0 and _find_cycle(pred):
+            has_negative_cycle = True  # Negative cycle detected
+            break
 
     # Check for negative cycles
-    for u in graph:
-        for v, weight in graph[u]:
-            if distances[u] != math.inf and distances[u] + weight < distances[v]:
-                return distances, predecessors, True  # Negative cycle detected
+    if has_negative_cycle is None:
+        has_negative_cycle = _record_violating_edge(indptr, indices, weights, dist, pred)
+
+    return _to_labels(csr, dist, pred, has_negative_cycle)
+
+def _record_violating_edge(indptr, indices, weights, dist, pred):
+    """
+    Looks for an edge u -> v that can still be relaxed after |V| - 1 passes. If one
+    exists, sets pred[v] = u, which closes a cycle in the predecessor graph (walking
+    back |V| steps from v is guaranteed to land on it), and returns True.
+    """
+    for u in range(len(dist)):
+        du = dist[u]
+        if du == math.inf:
+            continue
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if du + weights[k] < dist[v]:
+                pred[v] = u
+                return True
+    return False
+
+def find_negative_cycle(predecessors):
+    """
+    Looks for a cycle in the predecessor graph produced by Bellman-Ford. Such a
+    cycle only appears when the graph has a negative cycle reachable from the source.
+
+    Args:
+        predecessors: A dictionary mapping each vertex to its predecessor (or None).
+
+    Returns:
+        A list of vertices [v0, v1, ..., vk] such that v0 -> v1 -> ... -> vk -> v0
+        is a negative cycle, or an empty list if the predecessor graph is acyclic.
+    """
+    vertices = list(predecessors)
+    index = {vertex: i for i, vertex in enumerate(vertices)}
+    pred = [index[p] if p is not None else -1 for p in predecessors.values()]
+    return [vertices[i] for i in _find_cycle(pred)]
+
+def _find_cycle(pred):
+    """
+    find_negative_cycle over vertex ids, where pred[v] is v's predecessor id or -1.
+    """
+    # Every vertex has at most one predecessor, so following predecessors from
+    # each unvisited vertex finds any cycle in O(|V|) total
+    walk_of = [-1] * len(pred)
+    for start in range(len(pred)):
+        vertex = start
+        while vertex != -1 and walk_of[vertex] == -1:
+            walk_of[vertex] = start
+            vertex = pred[vertex]
+
+        if vertex != -1 and walk_of[vertex] == start:
+            # The walk ran into itself: collect the cycle, then put it in edge order
+            cycle = [vertex]
+            at = pred[vertex]
+            while at != vertex:
+                cycle.append(at)
+                at = pred[at]
+            cycle.reverse()
+            return cycle
+
+    return []
+
+def _to_labels(csr, dist, pred, has_negative_cycle):
+    """
+    Converts id-indexed distances and predecessors back into the label-keyed
+    (distances, predecessors, has_negative_cycle) result.
+    """
+    labels = csr.label_of
+    distances = dict(zip(labels, dist))
+    predecessors = {vertex: labels[p] if p >= 0 else None for vertex, p in zip(labels, pred)}
+    return distances, predecessors, has_negative_cycle
+
+def bellman_ford_numpy(graph, source):
+    """
+    Bellman-Ford with each relaxation pass vectorized over NumPy edge arrays.
+    The graph is flattened once into parallel src/dst/weight arrays, and a pass
+    relaxes every edge at once from the previous pass's distances.
+
+    Args:
+        graph: A dictionary (or CSRGraph) representing the graph, as for bellman_ford.
+        source: The starting vertex.
+
+    Returns:
+        The same (distances, predecessors, has_negative_cycle) tuple as bellman_ford.
+    """
+    csr = as_csr(graph)
+    src, dst, weights = csr.edge_arrays()
+    n = csr.num_vertices
+
+    dist = np.full(n, np.inf)
+    pred = np.full(n, -1, dtype=np.int64)
+    dist[csr.id_of[source]] = 0
+
+    # Up to |V| - 1 relaxation passes, plus one more to detect a negative cycle
+    has_negative_cycle = False
+    for i in range(n):
+        candidate = dist[src] + weights
+        better = candidate < dist[dst]
+        if not better.any():
+            break
+        if i == n - 1:
+            has_negative_cycle = True  # Still improving after |V| - 1 passes
+            break
+
+        # Unbuffered scatter-min, so several edges into one vertex keep the smallest
+        np.minimum.at(dist, dst[better], candidate[better])
+        winners = better & (candidate == dist[dst])
+        pred[dst[winners]] = src[winners]
+
+    return _to_labels(csr, dist.tolist(), pred.tolist(), has_negative_cycle)
+
+def spfa(graph, source):
+    """
+    Queue-based Bellman-Ford (Shortest Path Faster Algorithm). Only vertices whose
+    distance just decreased have their outgoing edges relaxed again, using the
+    Smallest Label First and Large Label Last heuristics to order the queue.
+
+    Args:
+        graph: A dictionary (or CSRGraph) representing the graph, as for bellman_ford.
+        source: The starting vertex.
+
+    Returns:
+        The same (distances, predecessors, has_negative_cycle) tuple as bellman_ford.
+    """
+    # Work on vertex ids over the CSR arrays; -1 means no predecessor
+    csr = as_csr(graph)
+    indptr, indices, weights = csr.indptr, csr.indices, csr.weights
+    n = csr.num_vertices
+    dist = [math.inf] * n
+    pred = [-1] * n
+    s = csr.id_of[source]
+    dist[s] = 0
+
+    # Number of edges on the current shortest path to each vertex; a simple path
+    # has at most |V| - 1, so reaching |V| means the path repeats a negative cycle
+    path_edges = [0] * n
+    in_queue = [False] * n
+    queue = deque([s])
+    in_queue[s] = True
+    queued_sum = 0  # Sum of the distances of the queued vertices, for LLL
+
+    while queue:
+        # Large Label Last: rotate vertices worse than the queue average to the back.
+        # queued_sum drifts with float weights and can fall below every queued
+        # distance, so rotate at most once around the queue
+        average = queued_sum / len(queue)
+        rotations = len(queue)
+        while rotations and dist[queue[0]] > average:
+            queue.append(queue.popleft())
+            rotations -= 1
+
+        u = queue.popleft()
+        in_queue[u] = False
+        du = dist[u]
+        queued_sum -= du
+
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            new_distance = du + weights[k]
+            if new_distance < dist[v]:
+                if in_queue[v]:
+                    queued_sum -= dist[v] - new_distance
+                dist[v] = new_distance
+                pred[v] = u
+                path_edges[v] = path_edges[u] + 1
+                if path_edges[v] >= n:
+                    return _to_labels(csr, dist, pred, True)  # Negative cycle detected
+
+                if not in_queue[v]:
+                    # Smallest Label First: a vertex better than the front goes first
+                    if queue and new_distance < dist[queue[0]]:
+                        queue.appendleft(v)
+                    else:
+                        queue.append(v)
+                    in_queue[v] = True
+                    queued_sum += new_distance
 
-    return distances, predecessors, False
+    return _to_labels(csr, dist, pred, False)
 
 if __name__ == '__main__':
     graph = {
@@ -50,7 +262,7 @@ if __name__ == '__main__':
     }
 
     source_node = 'A'
-    distances, predecessors, has_negative_cycle = bellman_ford(graph, source_node)
+    distances, predecessors, has_negative_cycle = bellman_ford(graph, source_node, rng=0)
 
     print(f"Shortest distances from source '{source_node}':")
     for vertex, distance in distances.items():
@@ -73,7 +285,7 @@ if __name__ == '__main__':
     }
 
     source_negative = 'X'
-    distances_neg, predecessors_neg, has_negative_cycle_neg = bellman_ford(negative_cycle_graph, source_negative)
+    distances_neg, predecessors_neg, has_negative_cycle_neg = bellman_ford(negative_cycle_graph, source_negative, rng=0)
 
     print(f"\nShortest distances from source '{source_negative}' in graph with negative cycle:")
     for vertex, distance in distances_neg.items():
@@ -81,5 +293,8 @@ if __name__ == '__main__':
 
     if has_negative_cycle_neg:
         print("\nWarning: The graph contains a negative cycle reachable from the source.")
+        cycle = find_negative_cycle(predecessors_neg)
+        if cycle:
+            print("Negative cycle:", " -> ".join(cycle + cycle[:1]))
     else:
         print("\nNo negative cycles detected.")
\ No newline at end of file
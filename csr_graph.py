@@ -0,0 +1,100 @@
+from array import array
+
+import numpy as np
+
+class CSRGraph:
+    """
+    Compressed sparse row (CSR) form of an adjacency-list graph, shared by the
+    Dijkstra, Bellman-Ford and Floyd-Warshall implementations.
+
+    The i-th key of the adjacency dict gets vertex id i (label_of[i] is the key,
+    id_of[key] is i). The edges out of vertex id u are indices[indptr[u]:indptr[u + 1]]
+    with matching weights[indptr[u]:indptr[u + 1]], all stored in flat typed arrays.
+    """
+
+    def __init__(self, adj_dict):
+        """
+        Args:
+            adj_dict: A dictionary where adj_dict[u] = [(v, w_uv), ...] lists the
+                      edges u -> v of weight w_uv. Every v must also be a key.
+        """
+        self.label_of = list(adj_dict)
+        self.id_of = {label: i for i, label in enumerate(self.label_of)}
+        self.indptr = array('i', [0])
+        self.indices = array('i')
+        self.weights = array('d')
+        for label in self.label_of:
+            for v, weight in adj_dict[label]:
+                self.indices.append(self.id_of[v])
+                self.weights.append(weight)
+            self.indptr.append(len(self.indices))
+        self._reversed = None
+
+    @classmethod
+    def from_arrays(cls, label_of, indptr, indices, weights):
+        """
+        Builds a CSRGraph directly from its CSR arrays (array.array of type 'i', 'i'
+        and 'd'), with label_of[i] the label of vertex id i.
+        """
+        graph = cls.__new__(cls)
+        graph.label_of = label_of
+        graph.id_of = {label: i for i, label in enumerate(label_of)}
+        graph.indptr = indptr
+        graph.indices = indices
+        graph.weights = weights
+        graph._reversed = None
+        return graph
+
+    @property
+    def num_vertices(self):
+        return len(self.label_of)
+
+    @property
+    def num_edges(self):
+        return len(self.indices)
+
+    def reverse(self):
+        """
+        Returns a CSRGraph with every edge reversed, keeping the same vertex ids and labels.
+        It is built once and cached, since the graph is not modified after construction.
+        """
+        if self._reversed is None:
+            src, dst, weights = self.edge_arrays()
+            order = np.argsort(dst, kind='stable')
+            indptr = array('i', [0])
+            indptr.extend(np.cumsum(np.bincount(dst, minlength=self.num_vertices)).tolist())
+            self._reversed = CSRGraph.from_arrays(
+                self.label_of,
+                indptr,
+                array('i', src[order].tolist()),
+                array('d', weights[order].tolist()),
+            )
+            self._reversed._reversed = self
+        return self._reversed
+
+    def edge_arrays(self):
+        """
+        Returns the edges as parallel NumPy arrays (src, dst, weights), in CSR order.
+        dst and weights share memory with the CSR arrays.
+        """
+        dst = np.frombuffer(self.indices, dtype=np.int32)
+        weights = np.frombuffer(self.weights, dtype=np.float64)
+        src = np.repeat(np.arange(self.num_vertices, dtype=np.int32), np.diff(self.indptr))
+        return src, dst, weights
+
+    def to_matrix(self):
+        """
+        Returns the dense adjacency matrix (float64, inf for missing edges), keeping the
+        lightest of any parallel edges. Rows and columns follow vertex ids.
+        """
+        matrix = np.full((self.num_vertices, self.num_vertices), np.inf)
+        src, dst, weights = self.edge_arrays()
+        np.minimum.at(matrix, (src, dst), weights)
+        return matrix
+
+def as_csr(graph):
+    """
+    Returns graph unchanged if it is already a CSRGraph, otherwise converts the
+    adjacency dict into one.
+    """
+    return graph if isinstance(graph, CSRGraph) else CSRGraph(graph)
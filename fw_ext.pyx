@@ -0,0 +1,40 @@
+# cython: language_level=3
+# distutils: extra_compile_args = -O3 -march=native -fopenmp
+# distutils: extra_link_args = -fopenmp
+"""
+Cython kernel for floyd_warshall.py. Build it in place with:
+
+    cythonize -i fw_ext.pyx
+"""
+cimport cython
+from cython.parallel cimport prange
+from libc.math cimport INFINITY
+from libc.stdint cimport int64_t
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def fw_cython(double[:, ::1] D, int64_t[:, ::1] N):
+    """
+    In-place Floyd-Warshall over D and N. For a fixed k the rows are
+    independent, so the i-loop runs in parallel without the GIL.
+    """
+    cdef Py_ssize_t n = D.shape[0]
+    cdef Py_ssize_t i, j, k
+    cdef double dik, dij, via_k
+    cdef int64_t nik
+    cdef bint take
+
+    for k in range(n):  # Intermediate vertex
+        for i in prange(n, nogil=True, schedule='static'):  # Source vertex
+            dik = D[i, k]
+            if dik == INFINITY:
+                continue  # Nothing goes through k from i, skip the whole row
+            nik = N[i, k]
+            for j in range(n):  # Destination vertex
+                # Branchless update: the C compiler emits minsd/cmov instead of a jump
+                via_k = dik + D[k, j]
+                dij = D[i, j]
+                take = via_k < dij
+                D[i, j] = via_k if take else dij
+                N[i, j] = nik if take else N[i, j]
@@ -0,0 +1,137 @@
+import math
+import random
+
+import bellman_ford as bellman_ford_module
+from bellman_ford import bellman_ford, bellman_ford_numpy, find_negative_cycle, spfa
+
+def _reference_bellman_ford(graph, source):
+    """Textbook Bellman-Ford: |V| - 1 full passes in a fixed order, then one check pass"""
+    dist = {v: math.inf for v in graph}
+    dist[source] = 0
+    edges = [(u, v, w) for u in graph for v, w in graph[u]]
+    for _ in range(len(graph) - 1):
+        for u, v, w in edges:
+            if dist[u] + w < dist[v]:
+                dist[v] = dist[u] + w
+    return dist, any(dist[u] + w < dist[v] for u, v, w in edges)
+
+def test_spfa_float_weights_terminates():
+    # Float rounding in the LLL running sum used to rotate the queue forever here
+    graph = {0: [(3, 0.1)], 1: [], 2: [], 3: [(0, 0.3), (1, 0.2), (2, 0.1)]}
+    distances, predecessors, has_negative_cycle = spfa(graph, 0)
+
+    assert not has_negative_cycle
+    assert distances[3] == 0.1
+    assert math.isclose(distances[1], 0.3)
+    assert predecessors == {0: None, 1: 3, 2: 3, 3: 0}
+
+def test_spfa_matches_bellman_ford_on_random_float_graphs():
+    rng = random.Random(0)
+    for _ in range(200):
+        n = rng.randint(1, 12)
+        graph = {
+            u: [(v, round(rng.uniform(0, 1), 1)) for v in range(n) if v != u and rng.random() < 0.4]
+            for u in range(n)
+        }
+        expected, _, _ = bellman_ford(graph, 0)
+        distances, _, has_negative_cycle = spfa(graph, 0)
+
+        assert not has_negative_cycle
+        for vertex in graph:
+            assert math.isclose(distances[vertex], expected[vertex]) or distances[vertex] == expected[vertex]
+
+def _cycle_weight(graph, cycle):
+    return sum(min(w for v, w in graph[u] if v == nxt) for u, nxt in zip(cycle, cycle[1:] + cycle[:1]))
+
+def test_negative_cycle_found_by_final_scan_is_in_predecessors():
+    # With 3 vertices the passes can end before the cycle closes in the predecessor
+    # graph, leaving only the final edge scan to find it
+    graph = {'X': [('Y', 2)], 'Y': [('Z', -4)], 'Z': [('X', 1)]}
+    for _ in range(200):
+        _, predecessors, has_negative_cycle = bellman_ford(graph, 'X')
+        assert has_negative_cycle
+        cycle = find_negative_cycle(predecessors)
+        assert sorted(cycle) == ['X', 'Y', 'Z']
+        assert _cycle_weight(graph, cycle) < 0
+
+def test_reported_negative_cycles_are_negative():
+    rng = random.Random(1)
+    for _ in range(500):
+        n = rng.randint(2, 12)
+        graph = {u: [(v, rng.randint(-4, 10)) for v in range(n) if rng.random() < 0.3] for u in range(n)}
+        _, predecessors, has_negative_cycle = bellman_ford(graph, 0)
+        cycle = find_negative_cycle(predecessors)
+
+        assert bool(cycle) == has_negative_cycle
+        if cycle:
+            assert _cycle_weight(graph, cycle) < 0
+
+def test_bellman_ford_is_reproducible_with_a_seed():
+    # Many equal-length paths, so the shuffled order decides the predecessors
+    graph = {u: [(v, 1) for v in range(8) if v != u] for u in range(8)}
+    graph[0] = [(v, 0) for v in range(1, 8)]
+    first = bellman_ford(graph, 0, rng=42)
+    for _ in range(5):
+        assert bellman_ford(graph, 0, rng=42) == first
+        assert bellman_ford(graph, 0, rng=random.Random(42)) == first
+
+def test_bellman_ford_leaves_global_random_state_alone():
+    random.seed(7)
+    expected = random.random()
+    random.seed(7)
+    bellman_ford({0: [(1, 1)], 1: [(0, 1)]}, 0)
+    assert random.random() == expected
+
+def test_bellman_ford_numpy_matches_reference():
+    rng = random.Random(2)
+    for _ in range(500):
+        n = rng.randint(1, 12)
+        graph = {u: [(v, rng.randint(-3, 10)) for v in range(n) if rng.random() < 0.3] for u in range(n)}
+        expected, expected_cycle = _reference_bellman_ford(graph, 0)
+        distances, predecessors, has_negative_cycle = bellman_ford_numpy(graph, 0)
+
+        assert has_negative_cycle == expected_cycle
+        if not has_negative_cycle:
+            assert distances == expected
+            for v, u in predecessors.items():
+                if u is not None:
+                    assert any(x == v and distances[u] + w == distances[v] for x, w in graph[u])
+
+def test_bellman_ford_matches_reference():
+    rng = random.Random(3)
+    for _ in range(500):
+        n = rng.randint(1, 12)
+        graph = {u: [(v, rng.randint(-3, 10)) for v in range(n) if rng.random() < 0.3] for u in range(n)}
+        expected, expected_cycle = _reference_bellman_ford(graph, 0)
+        distances, _, has_negative_cycle = bellman_ford(graph, 0, rng=rng)
+
+        assert has_negative_cycle == expected_cycle
+        if not has_negative_cycle:
+            assert distances == expected
+
+def _count_final_scans(monkeypatch):
+    calls = []
+    scan = bellman_ford_module._record_violating_edge
+    monkeypatch.setattr(bellman_ford_module, '_record_violating_edge', lambda *args: calls.append(1) or scan(*args))
+    return calls
+
+def test_bellman_ford_stops_once_converged(monkeypatch):
+    final_scans = _count_final_scans(monkeypatch)
+    graph = {u: [(u + 1, 1)] if u < 399 else [] for u in range(400)}
+    distances, _, has_negative_cycle = bellman_ford(graph, 0, rng=0)
+
+    assert not has_negative_cycle
+    assert distances[399] == 399
+    assert final_scans == []
+
+def test_bellman_ford_finds_cycle_in_predecessors_before_final_pass(monkeypatch):
+    final_scans = _count_final_scans(monkeypatch)
+    graph = {u: [] for u in range(400)}
+    graph[0] = [(1, 1)]
+    graph[1] = [(2, -3)]
+    graph[2] = [(1, 1)]
+    _, predecessors, has_negative_cycle = bellman_ford(graph, 0, rng=0)
+
+    assert has_negative_cycle
+    assert sorted(find_negative_cycle(predecessors)) == [1, 2]
+    assert final_scans == []
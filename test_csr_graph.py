@@ -0,0 +1,40 @@
+import numpy as np
+
+from csr_graph import CSRGraph
+
+def _edges(graph):
+    """The (src, dst, weight) edges of a CSRGraph, by label"""
+    return sorted(
+        (graph.label_of[u], graph.label_of[graph.indices[k]], graph.weights[k])
+        for u in range(graph.num_vertices)
+        for k in range(graph.indptr[u], graph.indptr[u + 1])
+    )
+
+def test_reverse_flips_every_edge():
+    graph = CSRGraph({'A': [('B', 1), ('C', 4)], 'B': [('C', 2), ('A', 3)], 'C': [], 'D': [('D', 5)]})
+    reversed_graph = graph.reverse()
+
+    assert reversed_graph.label_of == graph.label_of
+    assert reversed_graph.id_of == graph.id_of
+    assert list(reversed_graph.indptr) == [0, 1, 2, 4, 5]
+    assert _edges(reversed_graph) == sorted((v, u, w) for u, v, w in _edges(graph))
+
+def test_reverse_is_cached():
+    graph = CSRGraph({'A': [('B', 1)], 'B': []})
+    assert graph.reverse() is graph.reverse()
+    assert graph.reverse().reverse() is graph
+
+def test_edge_arrays_follow_csr_order():
+    graph = CSRGraph({'A': [('B', 1.5), ('C', 4)], 'B': [], 'C': [('A', -2)]})
+    src, dst, weights = graph.edge_arrays()
+
+    assert src.tolist() == [0, 0, 2]
+    assert dst.tolist() == [1, 2, 0]
+    assert weights.tolist() == [1.5, 4.0, -2.0]
+
+def test_to_matrix_keeps_lightest_parallel_edge():
+    graph = CSRGraph({'A': [('B', 5), ('B', 2), ('B', 7)], 'B': [('A', 3)]})
+    matrix = graph.to_matrix()
+
+    assert matrix.dtype == np.float64
+    assert matrix.tolist() == [[np.inf, 2.0], [3.0, np.inf]]
@@ -0,0 +1,108 @@
+import heapq
+import math
+import random
+
+import pytest
+
+from csr_graph import CSRGraph
+from Dijkstra import DIAL_MAX_WEIGHT, _IndexedMinHeap, astar, dijkstra, dijkstra_bidirectional, reconstruct_path
+
+def _random_graph(rng, n, density, weights):
+    return {u: [(v, weights(rng)) for v in range(n) if v != u and rng.random() < density] for u in range(n)}
+
+def _path_length(graph, path):
+    return sum(min(w for v, w in graph[u] if v == nxt) for u, nxt in zip(path, path[1:]))
+
+def _reference_dijkstra(graph, source):
+    """Textbook heapq Dijkstra with lazy deletion"""
+    dist = {v: math.inf for v in graph}
+    dist[source] = 0
+    queue = [(0, source)]
+    while queue:
+        d, u = heapq.heappop(queue)
+        if d > dist[u]:
+            continue
+        for v, w in graph[u]:
+            if d + w < dist[v]:
+                dist[v] = d + w
+                heapq.heappush(queue, (dist[v], v))
+    return dist
+
+@pytest.mark.parametrize('weights', [
+    lambda r: r.randint(0, DIAL_MAX_WEIGHT),  # Dial's bucket queue
+    lambda r: r.random() * 10,  # indexed heap
+])
+def test_dijkstra_matches_reference(weights):
+    rng = random.Random(1)
+    for _ in range(100):
+        n = rng.randint(1, 40)
+        graph = _random_graph(rng, n, rng.choice([0.05, 0.2, 0.5]), weights)
+        source = rng.randrange(n)
+        expected = _reference_dijkstra(graph, source)
+        dist, prev, depth = dijkstra(CSRGraph(graph), source)
+
+        for v in graph:
+            assert dist[v] == pytest.approx(expected[v])
+            path = reconstruct_path(prev, source, v)
+            assert reconstruct_path(prev, source, v, depth) == path
+            if expected[v] == math.inf:
+                assert path == [] and depth[v] == -1
+            else:
+                assert path[0] == source and path[-1] == v
+                assert depth[v] == len(path) - 1
+                assert _path_length(graph, path) == pytest.approx(dist[v])
+
+def test_indexed_heap_decrease_key():
+    rng = random.Random(2)
+    heap = _IndexedMinHeap(50)
+    keys = {}
+    for _ in range(300):
+        v = rng.randrange(50)
+        key = rng.random() * 100
+        if key < keys.get(v, math.inf):
+            heap.push(v, key)
+            keys[v] = key
+
+    assert len(heap) == len(keys)
+    popped = [heap.pop() for _ in range(len(keys))]
+    assert popped == sorted((key, v) for v, key in keys.items())
+    assert len(heap) == 0
+
+def test_bidirectional_matches_dijkstra():
+    rng = random.Random(0)
+    for _ in range(200):
+        n = rng.randint(1, 30)
+        graph = _random_graph(rng, n, rng.choice([0.05, 0.2, 0.5]), lambda r: r.choice([r.randint(0, 9), r.random() * 10]))
+        csr = CSRGraph(graph)
+        source = rng.randrange(n)
+        dist, _, _ = dijkstra(csr, source)
+        for target in range(n):
+            distance, path = dijkstra_bidirectional(csr, source, target)
+
+            assert math.isclose(distance, dist[target]) or distance == dist[target]
+            if dist[target] == math.inf:
+                assert path == []
+            else:
+                assert path[0] == source and path[-1] == target
+                assert math.isclose(_path_length(graph, path), distance, abs_tol=1e-9)
+
+def test_astar_with_inconsistent_heuristic():
+    rng = random.Random(3)
+    for _ in range(200):
+        n = rng.randint(2, 25)
+        graph = _random_graph(rng, n, 0.25, lambda r: r.randint(1, 20))
+        source, target = rng.sample(range(n), 2)
+        to_target = _reference_dijkstra(
+            {u: [(v, w) for v in graph for x, w in graph[v] if x == u] for u in graph}, target
+        )
+        # Admissible (never above the true distance) but not consistent
+        h_values = {v: 0 if d == math.inf else rng.choice([0, d]) for v, d in to_target.items()}
+        distance, path = astar(graph, source, target, h=h_values.get)
+
+        expected = _reference_dijkstra(graph, source)[target]
+        assert distance == expected
+        if expected == math.inf:
+            assert path == []
+        else:
+            assert path[0] == source and path[-1] == target
+            assert _path_length(graph, path) == distance
@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from floyd_warshall import (
+    FWWorkspace, floyd_warshall, floyd_warshall_blocked, floyd_warshall_cython, floyd_warshall_numba,
+    floyd_warshall_tropical,
+)
+
+inf = float('inf')
+
+def test_tropical_float_rounding_is_not_a_negative_cycle():
+    # Squaring sums the weights in a different order, so entries can shrink by one ULP
+    graph = [
+        [0, inf, .1, .1, .2],
+        [inf, 0, .7, inf, inf],
+        [.1, inf, 0, .3, .3],
+        [.1, .7, .7, 0, .1],
+        [inf, inf, .3, .7, 0],
+    ]
+    distances, _ = floyd_warshall_tropical(graph)
+    expected, _ = floyd_warshall(graph)
+    assert np.allclose(distances, expected)
+
+@pytest.mark.parametrize("graph", [
+    [[0, 1], [-2, 0]],
+    [[0, 1, inf, inf, inf], [inf, 0, 1, inf, inf], [inf, inf, 0, 1, inf],
+     [inf, inf, inf, 0, 1], [-5, inf, inf, inf, 0]],
+])
+def test_tropical_detects_negative_cycle(graph):
+    with pytest.raises(ValueError):
+        floyd_warshall_tropical(graph)
+
+def test_integer_dtype_matches_float():
+    graph = [[0, 3, inf, 7], [8, 0, 2, inf], [5, inf, 0, 1], [2, inf, inf, 0]]
+    expected, _ = floyd_warshall(graph)
+    distances, _ = floyd_warshall(graph, np.int32)
+
+    assert distances.dtype == np.int32
+    assert np.array_equal(distances, expected)
+
+def test_integer_sentinel_stays_in_floyd_warshall():
+    graph = [[0, inf, inf], [inf, 0, -1], [inf, inf, 0]]
+    with pytest.raises(ValueError):
+        floyd_warshall_numba(graph, ws=FWWorkspace(3, np.int32))
+
+@pytest.mark.parametrize("variant", [floyd_warshall_numba, floyd_warshall_cython])
+@pytest.mark.parametrize("dtype", [np.float32, np.int32])
+def test_compiled_variants_reject_non_float64_workspace(variant, dtype):
+    graph = [[0, 1], [inf, 0]]
+    with pytest.raises(ValueError, match="float64 workspace"):
+        variant(graph, ws=FWWorkspace(2, dtype))
+
+@pytest.mark.parametrize("variant", [floyd_warshall, floyd_warshall_numba, floyd_warshall_cython])
+def test_workspace_is_reused(variant):
+    graph = [[0, 3, inf, 7], [8, 0, 2, inf], [5, inf, 0, 1], [2, inf, inf, 0]]
+    expected, _ = floyd_warshall(graph)
+    ws = FWWorkspace(4)
+    for _ in range(2):
+        distances, _ = variant(graph, ws=ws)
+        assert distances is ws.D
+        assert np.array_equal(distances, expected)
+
+def _follow(next_vertex, start, end):
+    """reconstruct_path, but giving up after n steps instead of looping forever"""
+    path = [start]
+    while path[-1] != end and len(path) <= len(next_vertex):
+        path.append(int(next_vertex[path[-1]][end]))
+    return path
+
+@pytest.mark.parametrize("weight_range", [(0, 5), (0, 2)])
+def test_blocked_next_vertex_with_zero_weight_cycles(weight_range):
+    rng = np.random.default_rng(3)
+    n = 150
+    graph = np.where(rng.random((n, n)) < 0.03, rng.integers(*weight_range, (n, n)), np.inf)
+    graph = np.minimum(graph, graph.T)  # Undirected, so every zero-weight edge is a zero-weight cycle
+    distances, next_vertex = floyd_warshall_blocked(graph)
+
+    assert np.array_equal(distances, floyd_warshall(graph)[0])
+    for i in range(n):
+        for j in range(n):
+            if distances[i, j] == np.inf:
+                assert next_vertex[i, j] == -1
+                continue
+            path = _follow(next_vertex, i, j)
+            assert path[-1] == j
+            assert sum(graph[a, b] for a, b in zip(path, path[1:])) == distances[i, j]
+
+def test_blocked_power_of_two_result_is_contiguous():
+    rng = np.random.default_rng(0)
+    graph = np.where(rng.random((64, 64)) < 0.1, rng.integers(1, 10, (64, 64)), np.inf)
+    distances, next_vertex = floyd_warshall_blocked(graph, block_size=16)
+
+    assert distances.flags.c_contiguous and next_vertex.flags.c_contiguous
+    assert np.array_equal(distances, floyd_warshall(graph)[0])
+
+def test_dense_path_keeps_integer_sentinel_out_of_sums():
+    # Nothing reaches vertex 0, so most k take the masked dense branch; the negative
+    # weights would turn an unmasked sentinel sum into a bogus finite distance
+    n = 20
+    graph = [[(j - i) if j != 0 else inf for j in range(n)] for i in range(n)]
+    expected, expected_next = floyd_warshall(graph)
+    distances, next_vertex = floyd_warshall(graph, np.int32)
+
+    sentinel = np.iinfo(np.int32).max // 2
+    assert np.array_equal(np.where(distances == sentinel, inf, distances), expected)
+    assert np.array_equal(next_vertex, expected_next)
+
+@pytest.mark.parametrize("graph", [
+    [[0, .5, inf], [inf, 0, .4], [.3, inf, 0]],  # Would truncate to all zeros
+    [[0, 3e9], [inf, 0]],  # Would wrap around to a negative int32
+    [[0, np.iinfo(np.int32).max // 2], [inf, 0]],  # Would equal the no-path sentinel
+])
+def test_integer_dtype_rejects_unrepresentable_weights(graph):
+    with pytest.raises(ValueError):
+        floyd_warshall(graph, np.int32)